@@ -1,16 +1,15 @@
 import argparse
 import datetime
-import io
+import functools
+import mmap
 import os
 import re
 import sys
+import tempfile
 import termios
 import tty
 from pathlib import Path
 
-import gpxpy
-import gpxpy.gpx
-
 from rich.align import Align
 from rich.console import Console
 from rich.layout import Layout
@@ -26,48 +25,176 @@ def utc_to_local(utc_dt):
     return utc_dt.replace(tzinfo=datetime.timezone.utc).astimezone(tz=None)
 
 
-GPX_TIME_PATTERN = re.compile(
-    r"(<time>)(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z)(</time>)"
-)
+# GPX markup is ASCII, so the source is held as bytes: the regex engine
+# runs its fast single-byte loops and nothing is ever re-encoded on save.
+_TIME_PATTERN_SOURCE = rb"<time>(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})Z</time>"
+
+try:
+    # google-re2 runs fixed-shape patterns like this one as a linear-time
+    # DFA with vectorized matching; fall back to the stdlib engine.
+    import re2
+
+    GPX_TIME_PATTERN = re2.compile(_TIME_PATTERN_SOURCE)
+except ImportError:
+    GPX_TIME_PATTERN = re.compile(_TIME_PATTERN_SOURCE, re.ASCII)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Below this many timestamps the per-match Python loop wins; above it,
+# vectorized datetime64 arithmetic pays for the array round trip.
+NUMPY_MIN_TIMESTAMPS = 10_000
+
+
+def _parse_timestamp(ts):
+    # fromisoformat is implemented in C and beats both strptime and
+    # field-by-field int() slicing; the pattern already stripped the Z.
+    return datetime.datetime.fromisoformat(ts.decode("ascii")).replace(
+        tzinfo=datetime.timezone.utc
+    )
+
+
+def _scan_time_spans(gpx_text):
+    return [
+        (match.start(1), match.end(1), match.group(1))
+        for match in GPX_TIME_PATTERN.finditer(gpx_text)
+    ]
+
+
+def _bounds_from_spans(time_spans):
+    earliest = None
+    latest = None
+    # ISO-8601 UTC timestamps compare correctly as strings, so min/max
+    # can be tracked without constructing a datetime per point.
+    for _, _, ts in time_spans:
+        if earliest is None or ts < earliest:
+            earliest = ts
+        if latest is None or ts > latest:
+            latest = ts
+    if earliest is None:
+        return None, None
+    return _parse_timestamp(earliest), _parse_timestamp(latest)
+
+
+@functools.lru_cache(maxsize=None)
+def _shift_date(date_str, shift_days):
+    return (
+        datetime.date.fromisoformat(date_str.decode("ascii"))
+        + datetime.timedelta(days=shift_days)
+    ).isoformat().encode("ascii")
+
+
+@functools.lru_cache(maxsize=None)
+def _shift_timestamp(ts, shift_seconds):
+    shift_days, day_remainder_seconds = divmod(shift_seconds, 86400)
+    if day_remainder_seconds == 0:
+        # Whole-day shift: the THH:MM:SS suffix is invariant, so each
+        # unique date only needs to be shifted once.
+        return _shift_date(ts[:10], shift_days) + ts[10:]
+    shift_hours, remainder_seconds = divmod(shift_seconds, 3600)
+    if remainder_seconds == 0:
+        # Whole-hour shift: unless the hour rolls over the day
+        # boundary, only the HH field changes.
+        shifted_hour = int(ts[11:13]) + shift_hours
+        if 0 <= shifted_hour < 24:
+            return ts[:11] + b"%02d" % shifted_hour + ts[13:]
+    timestamp = _parse_timestamp(ts) + datetime.timedelta(seconds=shift_seconds)
+    return b"%04d-%02d-%02dT%02d:%02d:%02d" % (
+        timestamp.year,
+        timestamp.month,
+        timestamp.day,
+        timestamp.hour,
+        timestamp.minute,
+        timestamp.second,
+    )
+
+
+def _iter_shifted_chunks(gpx_text, shift_delta, time_spans=None):
+    shift_seconds = int(shift_delta.total_seconds())
+    if time_spans is None:
+        time_spans = _scan_time_spans(gpx_text)
+
+    if numpy is not None and len(time_spans) >= NUMPY_MIN_TIMESTAMPS:
+        arr = numpy.array([ts for _, _, ts in time_spans], dtype="datetime64[s]")
+        shifted = (arr.view("i8") + shift_seconds).view("datetime64[s]")
+        shifted_strs = numpy.datetime_as_string(shifted)
+        last = 0
+        for (start, end, _), shifted_ts in zip(time_spans, shifted_strs):
+            yield gpx_text[last:start]
+            yield str(shifted_ts).encode("ascii")
+            last = end
+        yield gpx_text[last:]
+        return
+
+    # Bind the rewrite helper to a local so the loop does a fast-frame
+    # load per timestamp instead of a global dict lookup.
+    shift_timestamp = _shift_timestamp
+    last = 0
+    for start, end, ts in time_spans:
+        yield gpx_text[last:start]
+        yield shift_timestamp(ts, shift_seconds)
+        last = end
+    yield gpx_text[last:]
 
 
 def shift_gpx_times(gpx_text, shift_delta):
     if not shift_delta or shift_delta == datetime.timedelta(0):
         return gpx_text
+    return b"".join(_iter_shifted_chunks(gpx_text, shift_delta))
 
-    def _replace(match):
-        timestamp_str = match.group(2)
-        timestamp = datetime.datetime.strptime(timestamp_str, "%Y-%m-%dT%H:%M:%SZ")
-        timestamp = timestamp.replace(tzinfo=datetime.timezone.utc) + shift_delta
-        return f"{match.group(1)}{timestamp.strftime('%Y-%m-%dT%H:%M:%SZ')}{match.group(3)}"
 
-    return GPX_TIME_PATTERN.sub(_replace, gpx_text)
+def _write_shifted(gpx_text, shift_delta, fh, time_spans=None):
+    if not shift_delta or shift_delta == datetime.timedelta(0):
+        fh.write(gpx_text)
+        return
+    for chunk in _iter_shifted_chunks(gpx_text, shift_delta, time_spans):
+        fh.write(chunk)
 
 
 class GPXShiftApp:
     def __init__(self, gpx_file_path):
         self.gpx_file_path = str(gpx_file_path)
         self.original_gpx_path = Path(self.gpx_file_path)
-        self.original_gpx_text = self.original_gpx_path.read_text()
-        self.original_gpx = self._parse_gpx_text(self.original_gpx_text)
-        self.current_gpx = self._parse_gpx_text(
-            self.original_gpx_text
-        ) 
+        # Map the file read-only rather than copying it into the heap;
+        # the span scan and save splices slice straight out of the map
+        # and the OS page cache is shared across saves.
+        with open(self.gpx_file_path, "rb") as f:
+            try:
+                self.original_gpx_text = mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            except ValueError:
+                # mmap cannot map an empty file.
+                self.original_gpx_text = f.read()
+        # One pass over the source records every <time> value with its
+        # offsets; bounds come from the same spans and saves splice by
+        # offset without rescanning.
+        self._ts_spans = _scan_time_spans(self.original_gpx_text)
+        self._original_bounds = _bounds_from_spans(self._ts_spans)
+        # Cached rewrites from a previously loaded file only take up room.
+        _shift_timestamp.cache_clear()
+        _shift_date.cache_clear()
         self.time_shift = datetime.timedelta(hours=0)
         self.display_utc = False
-
-    def _parse_gpx_text(self, gpx_text):
-        return gpxpy.parse(io.StringIO(gpx_text))
-
-    def get_start_end_times(self, gpx_data):
-        time_bounds = gpx_data.get_time_bounds()
-        if time_bounds:
-            return time_bounds.start_time, time_bounds.end_time
-        return None, None
+        self.layout = None
+        self._original_text = None
+        self._shifted_text = None
 
     def shift_time(self, hours):
         self.time_shift += datetime.timedelta(hours=hours)
-        self.current_gpx = self._apply_shift(self.original_gpx, self.time_shift)
+
+    @property
+    def original_bounds(self):
+        return self._original_bounds
+
+    @property
+    def current_bounds(self):
+        start, end = self._original_bounds
+        if start is None or end is None:
+            return None, None
+        return start + self.time_shift, end + self.time_shift
 
     def toggle_display_mode(self):
         self.display_utc = not self.display_utc
@@ -83,52 +210,6 @@ class GPXShiftApp:
         extension = self.original_gpx_path.suffix or ""
         return self.original_gpx_path.with_name(f"{stem}{suffix}{extension}")
 
-    def _apply_shift(self, gpx_data, shift_delta):
-        shifted_gpx = gpxpy.gpx.GPX()
-        shifted_gpx.creator = gpx_data.creator
-        shifted_gpx.version = gpx_data.version
-
-        for track in gpx_data.tracks:
-            new_track = gpxpy.gpx.GPXTrack()
-            new_track.name = track.name
-            for segment in track.segments:
-                new_segment = gpxpy.gpx.GPXTrackSegment()
-                for point in segment.points:
-                    new_point = gpxpy.gpx.GPXTrackPoint(
-                        latitude=point.latitude,
-                        longitude=point.longitude,
-                        elevation=point.elevation,
-                        time=point.time + shift_delta if point.time else None,
-                    )
-                    new_segment.points.append(new_point)
-                new_track.segments.append(new_segment)
-            shifted_gpx.tracks.append(new_track)
-
-        for waypoint in gpx_data.waypoints:
-            new_waypoint = gpxpy.gpx.GPXWaypoint(
-                latitude=waypoint.latitude,
-                longitude=waypoint.longitude,
-                elevation=waypoint.elevation,
-                time=waypoint.time + shift_delta if waypoint.time else None,
-            )
-            new_waypoint.name = waypoint.name
-            shifted_gpx.waypoints.append(new_waypoint)
-
-        for route in gpx_data.routes:
-            new_route = gpxpy.gpx.GPXRoute()
-            new_route.name = route.name
-            for point in route.points:
-                new_route_point = gpxpy.gpx.GPXRoutePoint(
-                    latitude=point.latitude,
-                    longitude=point.longitude,
-                    elevation=point.elevation,
-                    time=point.time + shift_delta if point.time else None,
-                )
-                new_route.points.append(new_route_point)
-            shifted_gpx.routes.append(new_route)
-
-        return shifted_gpx
-
     def save_gpx(self, output_file_path=None):
         if output_file_path:
             candidate_path = Path(os.path.expanduser(output_file_path))
@@ -140,104 +221,150 @@ class GPXShiftApp:
                 output_path = Path.cwd() / candidate_path
         else:
             output_path = self.get_default_output_path()
-        shifted_text = shift_gpx_times(self.original_gpx_text, self.time_shift)
-        output_path.write_text(shifted_text)
+        # Write to a sibling temp file and rename over the target.
+        # Opening the target directly would truncate it while our mmap
+        # still references its pages when saving over the input file,
+        # and the rename makes every save atomic.
+        tmp_fh = tempfile.NamedTemporaryFile(
+            mode="wb",
+            dir=output_path.parent,
+            prefix=output_path.name + ".",
+            delete=False,
+            buffering=1 << 20,
+        )
+        try:
+            with tmp_fh as fh:
+                _write_shifted(
+                    self.original_gpx_text, self.time_shift, fh, self._ts_spans
+                )
+            os.replace(tmp_fh.name, output_path)
+        except BaseException:
+            Path(tmp_fh.name).unlink(missing_ok=True)
+            raise
         return output_path
 
+    def close(self):
+        if isinstance(self.original_gpx_text, mmap.mmap):
+            self.original_gpx_text.close()
 
-def format_timedelta(td):
-    total_seconds = int(td.total_seconds())
-    sign = "-" if total_seconds < 0 else "+"
-    total_seconds = abs(total_seconds)
-    hours, remainder = divmod(total_seconds, 3600)
-    minutes, seconds = divmod(remainder, 60)
-    return f"{sign}{hours:02}:{minutes:02}:{seconds:02}"
+    def _time_zone_label(self):
+        return " (UTC)" if self.display_utc else " (Local)"
 
+    def _to_display(self, utc_dt):
+        return utc_dt if self.display_utc else utc_to_local(utc_dt)
 
-def make_layout(app):
-    original_start_utc, original_end_utc = app.get_start_end_times(app.original_gpx)
-    current_start_utc, current_end_utc = app.get_start_end_times(app.current_gpx)
-
-    if app.display_utc:
-        original_start_display = original_start_utc
-        original_end_display = original_end_utc
-        current_start_display = current_start_utc
-        current_end_display = current_end_utc
-        time_zone_label = " (UTC)"
-    else:
-        original_start_display = utc_to_local(original_start_utc)
-        original_end_display = utc_to_local(original_end_utc)
-        current_start_display = utc_to_local(current_start_utc)
-        current_end_display = utc_to_local(current_end_utc)
-        time_zone_label = " (Local)"
-
-    layout = Layout(name="root")
-
-    layout.split_column(
-        Layout(name="header", size=3),
-        Layout(name="times", ratio=2),
-        Layout(name="controls", size=5),
-    )
+    def _make_header_panel(self):
+        header_content = Align.center(
+            Text(
+                f"GPX Time Shifter - {os.path.basename(self.gpx_file_path)}",
+                style="bold white",
+            ),
+            vertical="middle",
+        )
+        return Panel(header_content, style="blue")
+
+    def _fill_original_text(self):
+        start_display = self._to_display(self._original_bounds[0])
+        end_display = self._to_display(self._original_bounds[1])
+        original_text = self._original_text
+        original_text.truncate(0)
+        original_text.append(
+            f"Original Times{self._time_zone_label()}\n", style="bold cyan"
+        )
+        original_text.append(
+            f"Start: {start_display.strftime('%Y-%m-%d %H:%M:%S') if start_display else 'N/A'}\n"
+        )
+        original_text.append(
+            f"End:   {end_display.strftime('%Y-%m-%d %H:%M:%S') if end_display else 'N/A'}"
+        )
+
+    def _fill_shifted_text(self):
+        current_start, current_end = self.current_bounds
+        start_display = self._to_display(current_start)
+        end_display = self._to_display(current_end)
+        shifted_text = self._shifted_text
+        shifted_text.truncate(0)
+        shifted_text.append(
+            f"Shifted Times{self._time_zone_label()}\n", style="bold magenta"
+        )
+        shifted_text.append(
+            f"Start: {start_display.strftime('%Y-%m-%d %H:%M:%S') if start_display else 'N/A'}\n"
+        )
+        shifted_text.append(
+            f"End:   {end_display.strftime('%Y-%m-%d %H:%M:%S') if end_display else 'N/A'}\n"
+        )
+        shifted_text.append(
+            f"Total Shift: {format_shift_hours(self.get_shift_hours())}",
+            style="bold yellow",
+        )
 
-    layout["times"].split_row(Layout(name="original"), Layout(name="shifted"))
+    def _make_controls_panel(self):
+        controls_text = Text()
+        controls_text.append("Controls: ", style="bold green")
+        controls_text.append(
+            "+ or = : Forward 1h  |  - or _ : Backward 1h  |  s : Save  |  q : Quit  |  t : Toggle UTC/Local"
+        )
+        return Panel(controls_text, title="[green]Help[/green]", border_style="green")
 
-    header_content = Align.center(
-        Text(
-            f"GPX Time Shifter - {os.path.basename(app.gpx_file_path)}",
-            style="bold white",
-        ),
-        vertical="middle",
-    )
-    layout["header"].update(Panel(header_content, style="blue"))
+    def build_initial_layout(self):
+        layout = Layout(name="root")
 
-    original_text = Text()
-    original_text.append(f"Original Times{time_zone_label}\n", style="bold cyan")
-    original_text.append(
-        f"Start: {original_start_display.strftime('%Y-%m-%d %H:%M:%S') if original_start_display else 'N/A'}\n"
-    )
-    original_text.append(
-        f"End:   {original_end_display.strftime('%Y-%m-%d %H:%M:%S') if original_end_display else 'N/A'}"
-    )
-    layout["original"].update(
-        Panel(original_text, title="[cyan]Original[/cyan]", border_style="cyan")
-    )
+        layout.split_column(
+            Layout(name="header", size=3),
+            Layout(name="times", ratio=2),
+            Layout(name="controls", size=5),
+        )
 
-    shifted_text = Text()
-    shifted_text.append(f"Shifted Times{time_zone_label}\n", style="bold magenta")
-    shifted_text.append(
-        f"Start: {current_start_display.strftime('%Y-%m-%d %H:%M:%S') if current_start_display else 'N/A'}\n"
-    )
-    shifted_text.append(
-        f"End:   {current_end_display.strftime('%Y-%m-%d %H:%M:%S') if current_end_display else 'N/A'}\n"
-    )
-    shifted_text.append(
-        f"Total Shift: {format_timedelta(app.time_shift)}", style="bold yellow"
-    )
-    layout["shifted"].update(
-        Panel(shifted_text, title="[magenta]Current[/magenta]", border_style="magenta")
-    )
+        layout["times"].split_row(Layout(name="original"), Layout(name="shifted"))
+
+        layout["header"].update(self._make_header_panel())
+        layout["controls"].update(self._make_controls_panel())
+
+        # The panels and their Text bodies are built once; refreshes
+        # rewrite the Text content in place and Rich re-renders the same
+        # objects, so a keypress allocates no new renderables.
+        self._original_text = Text()
+        self._shifted_text = Text()
+        self._fill_original_text()
+        self._fill_shifted_text()
+        layout["original"].update(
+            Panel(
+                self._original_text, title="[cyan]Original[/cyan]", border_style="cyan"
+            )
+        )
+        layout["shifted"].update(
+            Panel(
+                self._shifted_text,
+                title="[magenta]Current[/magenta]",
+                border_style="magenta",
+            )
+        )
 
-    controls_text = Text()
-    controls_text.append("Controls: ", style="bold green")
-    controls_text.append(
-        "+ or = : Forward 1h  |  - or _ : Backward 1h  |  s : Save  |  q : Quit  |  t : Toggle UTC/Local"
-    )
-    layout["controls"].update(
-        Panel(controls_text, title="[green]Help[/green]", border_style="green")
-    )
+        self.layout = layout
+        return layout
 
-    return layout
+    def refresh_shifted(self):
+        self._fill_shifted_text()
 
+    def refresh_times(self):
+        self._fill_original_text()
+        self._fill_shifted_text()
+
+
+def format_timedelta(td):
+    total_seconds = int(td.total_seconds())
+    if total_seconds % 3600 == 0:
+        return format_shift_hours(total_seconds // 3600)
+    sign = "-" if total_seconds < 0 else "+"
+    total_seconds = abs(total_seconds)
+    hours, remainder = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{sign}{hours:02}:{minutes:02}:{seconds:02}"
 
-def _getch():
-    fd = sys.stdin.fileno()
-    old_settings = termios.tcgetattr(fd)
-    try:
-        tty.setraw(sys.stdin.fileno())
-        ch = sys.stdin.read(1)
-    finally:
-        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-    return ch
+
+def format_shift_hours(hours):
+    sign = "-" if hours < 0 else "+"
+    return f"{sign}{abs(hours):02d}:00:00"
 
 
 def main():
@@ -254,22 +381,40 @@ def main():
 
     app = GPXShiftApp(args.gpx_file)
 
+    # Enter cbreak mode once for the whole session instead of toggling
+    # termios around every keystroke (two syscalls per keypress).
+    # cbreak rather than raw: it still delivers unbuffered single bytes
+    # without echo, but keeps output processing so Live's \n line
+    # endings render correctly. The save prompt temporarily restores
+    # cooked mode for line input.
+    fd = sys.stdin.fileno()
+    old_settings = termios.tcgetattr(fd)
+    tty.setcbreak(fd)
+    try:
+        _run_event_loop(app, console, fd, old_settings)
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+        app.close()
+
+
+def _run_event_loop(app, console, fd, old_settings):
     with Live(
-        make_layout(app), console=console, screen=True, auto_refresh=False
+        app.build_initial_layout(), console=console, screen=True, auto_refresh=False
     ) as live:
         while True:
-            key = _getch()
+            key = sys.stdin.read(1)
 
             if key in ("+", "="):
                 app.shift_time(1)
-                live.update(make_layout(app))
+                app.refresh_shifted()
                 live.refresh()
             elif key in ("-", "_"):
                 app.shift_time(-1)
-                live.update(make_layout(app))
+                app.refresh_shifted()
                 live.refresh()
             elif key == "s":
                 live.stop()
+                termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
                 console.clear()
                 default_output_path = app.get_default_output_path()
                 default_display_name = default_output_path.name
@@ -287,13 +432,15 @@ def main():
                 else:
                     console.print("[yellow]Save cancelled.[/yellow]")
                 console.input("Press Enter to continue...")
+                tty.setcbreak(fd)
                 live.start()
-                live.update(make_layout(app))
+                live.refresh()
             elif key == "q":
                 break
             elif key == "t":
                 app.toggle_display_mode()
-                live.update(make_layout(app))
+                app.refresh_times()
+                live.refresh()
 
 
 if __name__ == "__main__":
@@ -1,6 +1,10 @@
+import datetime
 from pathlib import Path
 
-from gpxshift import GPXShiftApp
+import pytest
+
+import gpxshift
+from gpxshift import GPXShiftApp, shift_gpx_times
 
 
 def _make_sample_gpx(time_str: str) -> str:
@@ -32,6 +36,19 @@ def test_shift_back_14_hours(tmp_path):
     assert output_path.read_text() == expected_path.read_text()
 
 
+def test_save_over_input_file(tmp_path):
+    input_path = tmp_path / "in_place.gpx"
+    input_path.write_text(_make_sample_gpx("2025-01-01T00:00:00Z"))
+
+    app = GPXShiftApp(str(input_path))
+    app.shift_time(5)
+    saved_path = app.save_gpx(str(input_path))
+    app.close()
+
+    assert saved_path == input_path
+    assert "<time>2025-01-01T05:00:00Z</time>" in input_path.read_text()
+
+
 def test_default_output_filename_positive_shift(tmp_path):
     input_path = tmp_path / "morning_run.gpx"
     input_path.write_text(_make_sample_gpx("2025-01-01T00:00:00Z"))
@@ -62,3 +79,55 @@ def test_default_output_filename_negative_shift(tmp_path):
     assert saved_path == default_path
     assert saved_path.exists()
     assert "<time>2025-01-01T10:00:00Z</time>" in saved_path.read_text()
+
+
+def test_numpy_path_matches_scalar_path(monkeypatch):
+    pytest.importorskip("numpy")
+
+    start = datetime.datetime(2025, 6, 30, 22, 0, 0)
+    points = "".join(
+        f'      <trkpt lat="0" lon="0">\n'
+        f"        <time>{(start + datetime.timedelta(seconds=i)).strftime('%Y-%m-%dT%H:%M:%S')}Z</time>\n"
+        f"      </trkpt>\n"
+        for i in range(gpxshift.NUMPY_MIN_TIMESTAMPS)
+    )
+    gpx_bytes = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<gpx version="1.1" creator="pytest">\n'
+        "  <trk>\n    <trkseg>\n"
+        f"{points}"
+        "    </trkseg>\n  </trk>\n</gpx>\n"
+    ).encode("ascii")
+    shift = datetime.timedelta(hours=3)
+
+    vectorized = shift_gpx_times(gpx_bytes, shift)
+
+    monkeypatch.setattr(gpxshift, "NUMPY_MIN_TIMESTAMPS", len(gpx_bytes))
+    scalar = shift_gpx_times(gpx_bytes, shift)
+
+    assert vectorized == scalar
+    assert b"<time>2025-07-01T01:00:00Z</time>" in vectorized
+
+
+def test_whole_day_shift_forward(tmp_path):
+    input_path = tmp_path / "day_forward.gpx"
+    input_path.write_text(_make_sample_gpx("2025-01-31T23:59:59Z"))
+
+    app = GPXShiftApp(str(input_path))
+    app.shift_time(24)
+
+    saved_path = app.save_gpx()
+    assert saved_path == tmp_path / "day_forward_p24.gpx"
+    assert "<time>2025-02-01T23:59:59Z</time>" in saved_path.read_text()
+
+
+def test_whole_day_shift_backward_across_month_boundary(tmp_path):
+    input_path = tmp_path / "day_backward.gpx"
+    input_path.write_text(_make_sample_gpx("2025-03-01T10:00:00Z"))
+
+    app = GPXShiftApp(str(input_path))
+    app.shift_time(-24)
+
+    saved_path = app.save_gpx()
+    assert saved_path == tmp_path / "day_backward_m24.gpx"
+    assert "<time>2025-02-28T10:00:00Z</time>" in saved_path.read_text()